@@ -2,16 +2,22 @@
 # -*- coding: utf-8 -*-
 
 import streamlit as st
-import re, json, io, os, calendar
+import re, json, io, os, calendar, hashlib, tempfile
 from datetime import datetime, timedelta, date
-from typing import Dict, List, Tuple, Optional
+from functools import lru_cache
+from typing import Any, Dict, List, Tuple, Optional
 from google.oauth2.service_account import Credentials
 from google.auth.transport.requests import AuthorizedSession
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from PIL import Image, ImageDraw, ImageFont
 
 # ===================== CONFIG =====================
 SHEET_URL = "https://docs.google.com/spreadsheets/d/1CsT6_oYsFjgQQ73pt1Bl1cuXuzKY8JnOTB3E4bDkTiA/edit?usp=sharing"
 BILLING_TAB = "BillingCycle"   # headers: Client | Start | End
+ORDERS_RANGE = "Orders_Output!A2:M"
+BILLING_RANGE = f"{BILLING_TAB}!A1:C"
+HTTP_TIMEOUT = (5, 30)  # (connect, read) seconds for Sheets calls
 
 # clientlist sheet structure
 COL_B_CLIENT = 1
@@ -41,6 +47,13 @@ TEMPLATE_CANDIDATES = [
     "assets/invoice_template.png",
 ]
 
+# Admin add-on quantity inputs on the three-column row: (session key, label)
+ADMIN_QTY_FIELDS = (
+    ("q_sea",   "Seafood qty"),
+    ("q_juice", "Juice qty"),
+    ("q_snack", "Snack qty"),
+)
+
 # ======= Fine-tuned layout for your PNG (based on your last screenshot) =======
 LAYOUT = {
     "fonts": {
@@ -81,6 +94,8 @@ LAYOUT = {
 }
 
 # ===================== Auth & Sheets helpers =====================
+# one authorized session per process: token refresh and TLS connections survive reruns
+@st.cache_resource(show_spinner=False)
 def get_service_account_session() -> AuthorizedSession:
     try:
         sec = st.secrets["gcp_credentials"]
@@ -90,13 +105,21 @@ def get_service_account_session() -> AuthorizedSession:
     try:
         sa_info = json.loads(sec["value"]) if isinstance(sec, dict) and "value" in sec else dict(sec)
         creds = Credentials.from_service_account_info(sa_info, scopes=SCOPES)
-        return AuthorizedSession(creds)
+        session = AuthorizedSession(creds)
+        # Google only gzips responses when the User-Agent mentions gzip
+        session.headers.update({"Accept-Encoding": "gzip, deflate", "User-Agent": "friska-billing (gzip)"})
+        # urllib3's default allowed_methods leaves POST (values:append) out of retries
+        retry = Retry(total=3, backoff_factor=0.3, status_forcelist=(429, 500, 502, 503, 504))
+        session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=10, max_retries=retry))
+        return session
     except Exception as e:
         st.error(f"Could not initialize Google credentials: {e}")
         st.stop()
 
+_SHEET_ID_RE = re.compile(r"/spreadsheets/d/([a-zA-Z0-9-_]+)")
+
 def get_spreadsheet_id(url: str) -> str:
-    m = re.search(r"/spreadsheets/d/([a-zA-Z0-9-_]+)", url)
+    m = _SHEET_ID_RE.search(url)
     if not m:
         st.error("Invalid SHEET_URL.")
         st.stop()
@@ -110,51 +133,72 @@ def load_settings():
         return DEFAULT_SETTINGS.copy()
 
 def save_settings(s: dict):
-    with open(SETTINGS_FILE, "w", encoding="utf-8") as f:
-        json.dump(s, f, indent=2)
-
-WEEKDAY_PREFIX = re.compile(
-    r"^\s*(Mon|Tue|Wed|Thu|Fri|Sat|Sun|Monday|Tuesday|Wednesday|Thursday|Friday|Saturday|Sunday)\s*,\s*",
-    re.I
+    # write a unique temp file, then swap it in: a failed write can't truncate settings.json
+    # and concurrent sessions saving at once never share a temp file
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(SETTINGS_FILE)), suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(json.dumps(s, indent=2))
+        # mkstemp creates 0600; keep settings.json's existing mode instead
+        try: mode = os.stat(SETTINGS_FILE).st_mode & 0o777
+        except OSError: mode = 0o644
+        os.chmod(tmp, mode)
+        os.replace(tmp, SETTINGS_FILE)
+    except BaseException:
+        try: os.remove(tmp)
+        except OSError: pass
+        raise
+
+_MONTH_ABBR = ("", "Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec")
+_SERIAL_EPOCH = datetime(1899, 12, 30)  # day 0 of Sheets serial dates
+_MONTHS = {m.lower(): i for i, m in enumerate(calendar.month_abbr) if m}
+_D, _M, _Y = r"(3[01]|[12]\d|0[1-9]|[1-9]| [1-9])", r"(1[0-2]|0[1-9]|[1-9])", r"(\d{4}|\d{2})"
+# day-first text dates: 05-Mar-2024, 5-3-2024, 2024-03-05, 05/03/2024, 05 Mar 24
+_DATE_PATTERNS = (
+    (re.compile(rf"{_D}-([a-z]{{3}})-{_Y}", re.I),     "dmy"),
+    (re.compile(rf"{_D}-{_M}-{_Y}"),                   "dmy"),
+    (re.compile(rf"(\d{{4}})-{_M}-{_D}"),              "ymd"),
+    (re.compile(rf"{_D}/{_M}/{_Y}"),                   "dmy"),
+    (re.compile(rf"{_D}\s+([a-z]{{3}})\s+{_Y}", re.I), "dmy"),
 )
+
+# order dates repeat across rows and across the usage/resume/adjust scans
+@lru_cache(maxsize=4096)
 def to_dt(v) -> Optional[datetime]:
     if not v:
         return None
 
-    # Numeric (Google serial)
+    # Numeric (Google serial) — the common case with UNFORMATTED_VALUE reads
     try:
         if isinstance(v, (int, float)):
-            return datetime(1899, 12, 30) + timedelta(days=float(v))
+            return _SERIAL_EPOCH + timedelta(days=v)
         if str(v).replace(".", "", 1).isdigit():
-            return datetime(1899, 12, 30) + timedelta(days=float(v))
+            return _SERIAL_EPOCH + timedelta(days=float(v))
     except:
         pass
 
     s = str(v).strip()
 
-    # Try multiple common formats
-    formats = [
-        "%d-%b-%Y",
-        "%d-%b-%y",
-        "%d-%m-%Y",
-        "%d-%m-%y",
-        "%Y-%m-%d",
-        "%d/%m/%Y",
-        "%d/%m/%y",
-        "%d %b %Y",
-        "%d %b %y",
-    ]
-
-    for fmt in formats:
+    # the first pattern that fully matches decides; an impossible date (31-Feb) gives None
+    for rx, order in _DATE_PATTERNS:
+        m = rx.fullmatch(s)
+        if not m: continue
+        g = dict(zip(order, m.groups()))
+        mon = g["m"]
+        mon = int(mon) if mon.isdigit() else _MONTHS.get(mon.lower())
+        y = int(g["y"])
+        if len(g["y"]) == 2: y += 2000 if y <= 68 else 1900  # 00-68 -> 20xx, 69-99 -> 19xx
         try:
-            return datetime.strptime(s, fmt)
-        except:
-            continue
+            return datetime(y, mon, int(g["d"])) if mon else None
+        except ValueError:
+            return None
 
     return None
 
 def dtstr(d: date) -> str:
-    return d.strftime("%d-%b-%Y")
+    # dd-MMM-YYYY with English month abbreviations, whatever the process locale
+    return f"{d.day:02d}-{_MONTH_ABBR[d.month]}-{d.year}"
+
 def detect_clientlist_structure(header_row: List):
     """
     Dynamically detects:
@@ -176,40 +220,57 @@ def detect_clientlist_structure(header_row: List):
 
     return first_date_col, delivery_col
 
+@lru_cache(maxsize=8192)  # client names repeat on every order row
 def norm_name(s: str) -> str:
-    return re.sub(r"\s+", " ", (s or "").strip()).lower()
+    # split()/join trims and collapses any run of Unicode whitespace to one space
+    return " ".join(str(s or "").split()).lower()
 
 def fetch_values(session: AuthorizedSession, spid: str, a1_range: str) -> List[List[str]]:
     from urllib.parse import quote
     enc = quote(a1_range, safe="")
     url = f"https://sheets.googleapis.com/v4/spreadsheets/{spid}/values/{enc}"
-    r = session.get(url, params={"valueRenderOption": "UNFORMATTED_VALUE"}, timeout=30)
+    params = {"valueRenderOption": "UNFORMATTED_VALUE", "fields": "values"}
+    r = session.get(url, params=params, timeout=HTTP_TIMEOUT)
     if r.status_code == 403:
         st.error("Permission denied. Share the Sheet with the service account (Editor).")
         st.stop()
     r.raise_for_status()
     return r.json().get("values", []) or []
 
+def fetch_values_batch(session: AuthorizedSession, spid: str, ranges: List[str]) -> Dict[str, List[List[str]]]:
+    # one values:batchGet round-trip; valueRanges come back in request order
+    url = f"https://sheets.googleapis.com/v4/spreadsheets/{spid}/values:batchGet"
+    params = [("ranges", a1) for a1 in ranges]
+    params += [("valueRenderOption", "UNFORMATTED_VALUE"), ("fields", "valueRanges(values)")]
+    r = session.get(url, params=params, timeout=HTTP_TIMEOUT)
+    if r.status_code == 403:
+        st.error("Permission denied. Share the Sheet with the service account (Editor).")
+        st.stop()
+    r.raise_for_status()
+    vranges = r.json().get("valueRanges", []) or []
+    return {a1: (vr.get("values", []) or []) for a1, vr in zip(ranges, vranges)}
+
 def append_values(session: AuthorizedSession, spid: str, sheet: str, rows: List[List[str]]):
     url = f"https://sheets.googleapis.com/v4/spreadsheets/{spid}/values/{sheet}!A:C:append"
-    params = {"valueInputOption": "RAW", "insertDataOption": "INSERT_ROWS"}
+    params = {"valueInputOption": "RAW", "insertDataOption": "INSERT_ROWS",
+              "includeValuesInResponse": "false", "fields": "updates.updatedRange"}
     body = {"values": rows}
-    r = session.post(url, params=params, json=body, timeout=30)
+    r = session.post(url, params=params, json=body, timeout=HTTP_TIMEOUT)
     r.raise_for_status()
     return r.json()
 
 def update_values(session: AuthorizedSession, spid: str, range_a1: str, rows: List[List[str]]):
     url = f"https://sheets.googleapis.com/v4/spreadsheets/{spid}/values/{range_a1}"
-    params = {"valueInputOption": "RAW"}
+    params = {"valueInputOption": "RAW", "includeValuesInResponse": "false", "fields": "updatedRange"}
     body = {"range": range_a1, "values": rows, "majorDimension": "ROWS"}
-    r = session.put(url, params=params, json=body, timeout=30)
+    r = session.put(url, params=params, json=body, timeout=HTTP_TIMEOUT)
     r.raise_for_status()
     return r.json()
 
 def get_clientlist_sheet_title(session: AuthorizedSession, spid: str, month_full: str) -> Tuple[Optional[str], List[str]]:
     desired1 = f"clientlist {month_full}".lower()
     desired2 = f"clientlist {month_full[:3]}".lower()
-    meta = session.get(f"https://sheets.googleapis.com/v4/spreadsheets/{spid}", timeout=30).json()
+    meta = session.get(f"https://sheets.googleapis.com/v4/spreadsheets/{spid}", timeout=HTTP_TIMEOUT).json()
     titles = [sh["properties"]["title"] for sh in meta.get("sheets", [])]
     for t in titles:
         tl = t.lower().strip()
@@ -226,10 +287,12 @@ def month_span_inclusive(a: date, b: date) -> List[Tuple[int, int]]:
         else: m += 1
     return out
 
+_NON_NUMERIC_RE = re.compile(r"[^0-9\.\-]")
+
 def parse_float(x) -> float:
     try:
         s = "" if x is None else str(x).strip()
-        num = re.sub(r"[^0-9\.\-]", "", s)
+        num = _NON_NUMERIC_RE.sub("", s)
         return float(num) if num else 0.0
     except: return 0.0
 
@@ -262,6 +325,15 @@ def compute_delivery_per_day_for_rows(
         return (sum(prices) if prices else 0.0), "sum_shifts", []
     return (max(prices) if prices else 0.0), "single_mismatch", []
 
+# Orders_Output columns H..M in order, and the meal options that mark a seafood add-on
+_USAGE_KEYS = ("meal1", "meal2", "brk", "snack", "j1", "j2")
+_SEAFOOD_TAGS = ("seafood 1", "seafood 2")
+
+def client_order_rows(data, client_name: str) -> List[List]:
+    # one pass over Orders_Output; usage/resume/adjust scans then only see this client's rows
+    client_key = norm_name(client_name)
+    return [row for row in data if len(row) >= 2 and norm_name(row[1]) == client_key]
+
 def count_usage(data, start: date, end: date, client_name: str):
     client_key = norm_name(client_name)
 
@@ -269,25 +341,18 @@ def count_usage(data, start: date, end: date, client_name: str):
     active_days_set = set()
     slot_counts = {}
     last_active_date = None
-    paused_dates: List[date] = []
     last_per_day_delivery = 0.0
 
-    # Fetch full Orders_Output sheet (no row limit)
-
-    if not data:
-        return totals, 0, 0, 0, [], 0.0
-
-    # Build full billing range excluding Sundays
-    all_service_dates = []
-    cur = start
-    while cur <= end:
-        if cur.weekday() != 6:  # Sunday = 6
-            all_service_dates.append(cur)
-        cur += timedelta(days=1)
+    # Build full billing range excluding Sundays (weekday from offset, no per-day weekday())
+    wd0 = start.weekday()
+    all_service_dates = [start + timedelta(days=i) for i in range((end - start).days + 1)
+                         if (wd0 + i) % 7 != 6]  # Sunday = 6
 
     total_days = len(all_service_dates)
 
-    delivery_rates = []
+    max_delivery: Optional[float] = None
+    # plain list/int accumulators in the loop; folded into totals once at the end
+    counts = [0] * len(_USAGE_KEYS); seafood = 0
 
     for row in data:
 
@@ -297,6 +362,11 @@ def count_usage(data, start: date, end: date, client_name: str):
         if len(row) < 2:
             continue
 
+        # ---- CLIENT MATCH ----
+        # name check before the date parse, so to_dt only runs on this client's rows
+        if norm_name(row[1]) != client_key:
+            continue
+
         # ---- DATE PARSE ----
         dt = to_dt(row[0])
         if not dt:
@@ -310,85 +380,47 @@ def count_usage(data, start: date, end: date, client_name: str):
         if row_date.weekday() == 6:
             continue
 
-        # ---- CLIENT MATCH ----
-        if norm_name(row[1]) != client_key:
-            continue
-
-        # ---- SAFE COLUMN ACCESS ----
-        def get_cell(idx):
-            return str(row[idx]).strip() if idx < len(row) else ""
-
-        opt1 = get_cell(7)
-        opt2 = get_cell(8)
-        brk  = get_cell(9)
-        snk  = get_cell(10)
-        j1   = get_cell(11)
-        j2   = get_cell(12)
-
-        meal_count_this_row = 0
-
         # ---- MEAL COUNTING ----
-        if opt1 and opt1 != "N/A":
-            totals["meal1"] += 1
-            meal_count_this_row += 1
-            if norm_name(opt1) == "seafood 1":
-                totals["seafood"] += 1
-
-        if opt2 and opt2 != "N/A":
-            totals["meal2"] += 1
-            meal_count_this_row += 1
-            if norm_name(opt2) == "seafood 2":
-                totals["seafood"] += 1
-
-        if brk and brk != "N/A":
-            totals["brk"] += 1
-            meal_count_this_row += 1
-
-        if snk and snk != "N/A":
-            totals["snack"] += 1
-            meal_count_this_row += 1
-
-        if j1 and j1 != "N/A":
-            totals["j1"] += 1
+        # cols 7..12; short rows just yield fewer cells, same as treating them as empty
+        meal_count_this_row = 0
+        for i, cell in enumerate(row[7:13]):
+            cell = str(cell).strip()
+            if not cell or cell == "N/A": continue
+            counts[i] += 1
             meal_count_this_row += 1
+            if i < 2 and norm_name(cell) == _SEAFOOD_TAGS[i]:
+                seafood += 1
 
-        if j2 and j2 != "N/A":
-            totals["j2"] += 1
-            meal_count_this_row += 1
+        slot = str(row[5]).strip() if len(row) > 5 else ""
 
         if meal_count_this_row > 0:
             active_days_set.add(row_date)
         
-            slot = str(row[5]).strip() if len(row) > 5 else ""
-        
             # old data may not have slot
-            if not slot:
-                slot = "No Delivery Slot"
-        
-            slot_counts[slot] = slot_counts.get(slot, 0) + 1
+            slot_key = slot or "No Delivery Slot"
+            slot_counts[slot_key] = slot_counts.get(slot_key, 0) + 1
         
             if not last_active_date or row_date > last_active_date:
                 last_active_date = row_date
         
         # ---- DELIVERY RATE LEARNING ----
-        delivery_price = parse_float(get_cell(5))
-        if delivery_price:
-            delivery_rates.append(delivery_price)
+        delivery_price = parse_float(slot)
+        if delivery_price and (max_delivery is None or delivery_price > max_delivery):
+            max_delivery = delivery_price
 
+    totals.update(zip(_USAGE_KEYS, counts)); totals["seafood"] = seafood
     active_days = len(active_days_set)
 
     # Paused days = service dates with no activity
-    for d in all_service_dates:
-        if d not in active_days_set:
-            paused_dates.append(d)
+    paused_dates = [d for d in all_service_dates if d not in active_days_set]
 
     paused_days = len(paused_dates)
 
     totals["meals_total"] = totals["meal1"] + totals["meal2"]
     totals["juices_total"] = totals["j1"] + totals["j2"]
 
-    if delivery_rates:
-        last_per_day_delivery = max(delivery_rates)
+    if max_delivery is not None:
+        last_per_day_delivery = max_delivery
 
     return totals, active_days, paused_days, total_days, paused_dates, last_per_day_delivery, last_active_date, slot_counts
 
@@ -401,6 +433,9 @@ def find_resume_date(data, client_name, after_date, max_days=90):
         if not row or len(row) < 2:
             continue
 
+        if norm_name(row[1]) != client_key:
+            continue
+
         dt = to_dt(row[0])
         if not dt:
             continue
@@ -410,9 +445,6 @@ def find_resume_date(data, client_name, after_date, max_days=90):
         if not (after_date < d <= limit_date):
             continue
 
-        if norm_name(row[1]) != client_key:
-            continue
-
         # any activity counts
         for idx in [7,8,9,10,11,12]:
             if idx < len(row):
@@ -431,6 +463,9 @@ def find_next_active_dates(data, client_name, start_date, needed):
         if not row or len(row) < 2:
             continue
 
+        if norm_name(row[1]) != client_key:
+            continue
+
         dt = to_dt(row[0])
         if not dt:
             continue
@@ -440,9 +475,6 @@ def find_next_active_dates(data, client_name, start_date, needed):
         if d < start_date:
             continue
 
-        if norm_name(row[1]) != client_key:
-            continue
-
         # check activity
         for idx in [7,8,9,10,11,12]:
             if idx < len(row):
@@ -454,8 +486,10 @@ def find_next_active_dates(data, client_name, start_date, needed):
     rows_with_dates = sorted(set(rows_with_dates))
 
     return rows_with_dates[:needed]
-def get_prev_cycle_for_client(session: AuthorizedSession, spid: str, client_name: str) -> Tuple[Optional[date], Optional[date], Optional[int]]:
-    vals = fetch_values(session, spid, f"{BILLING_TAB}!A1:C10000")
+def get_prev_cycle_for_client(session: AuthorizedSession, spid: str, client_name: str,
+                              vals: Optional[List[List[str]]] = None) -> Tuple[Optional[date], Optional[date], Optional[int]]:
+    if vals is None:
+        vals = fetch_values(session, spid, BILLING_RANGE)
     if not vals or len(vals) < 2:
         return None, None, None
     headers = [x.strip().lower() for x in vals[0]]
@@ -464,11 +498,14 @@ def get_prev_cycle_for_client(session: AuthorizedSession, spid: str, client_name
     except ValueError:
         return None, None, None
     key = norm_name(client_name)
-    last_row = None; last_row_index = None
-    for idx, r in enumerate(vals[1:], start=1):
-        if len(r) <= max(ci, si, ei): continue
+    # latest cycle sits near the bottom: scan upward and stop at the first hit
+    last_row = None; last_row_index = None; need = max(ci, si, ei)
+    for idx in range(len(vals) - 1, 0, -1):
+        r = vals[idx]
+        if len(r) <= need: continue
         if norm_name(r[ci]) == key:
             last_row = r; last_row_index = idx
+            break
     if last_row is None:
         return None, None, None
     sd = to_dt(last_row[si]); ed = to_dt(last_row[ei])
@@ -490,7 +527,10 @@ def percent_to_px(w, h, perc_xy):
     y = int(round((perc_xy[1] / 100.0) * h))
     return x, y
 
-def _pick_font(paths: List[str], px: int) -> ImageFont.FreeTypeFont:
+# truetype() re-parses the TTF from disk; cache_resource keeps faces across reruns
+# (a module-level lru_cache would be rebuilt each time Streamlit re-executes the script)
+@st.cache_resource(max_entries=32, show_spinner=False)
+def _pick_font(paths: Tuple[str, ...], px: int) -> ImageFont.FreeTypeFont:
     for p in paths:
         try:
             return ImageFont.truetype(p, px)
@@ -506,13 +546,18 @@ def _draw_text(draw: ImageDraw.ImageDraw, text: str, xy_px: Tuple[int,int],
         x = x - int(w)
     draw.text((x, y), text, fill=(0,0,0), font=font)
 
-def try_load_template() -> Optional[Image.Image]:
+@st.cache_resource(ttl=24*60*60, show_spinner=False)
+def _open_template(path: str) -> Image.Image:
+    # shared across reruns by reference — callers must .copy() before drawing
+    return Image.open(path).convert("RGB")
+
+def try_load_template() -> Tuple[Optional[Image.Image], Optional[str]]:
     for p in TEMPLATE_CANDIDATES:
         try:
-            return Image.open(p).convert("RGB")
+            return _open_template(p), p
         except Exception:
             continue
-    return None
+    return None, None
 
 def render_invoice_image(template: Image.Image, fields: Dict[str, str], rows: List[Dict[str, str]]) -> Image.Image:
     img = template.copy()
@@ -520,45 +565,103 @@ def render_invoice_image(template: Image.Image, fields: Dict[str, str], rows: Li
     W, H = img.size
 
     base_px = max(12, int(LAYOUT["fonts"]["scale"] * H))
+
+    # only a handful of (weight, size) variants per invoice — resolve each once
+    fonts: Dict[Tuple[bool, int], ImageFont.FreeTypeFont] = {}
+    def font_for(bold, size_px: int) -> ImageFont.FreeTypeFont:
+        k = (bool(bold), size_px)
+        if k not in fonts:
+            fonts[k] = _pick_font(tuple(LAYOUT["fonts"]["bold"] if bold else LAYOUT["fonts"]["regular"]), size_px)
+        return fonts[k]
+
     for key, spec in LAYOUT["header"].items():
         val = fields.get(key, "") or ""
         x, y = percent_to_px(W, H, spec["xy"])
         size_px = int(spec.get("size", 1.0) * base_px)
-        font = _pick_font(LAYOUT["fonts"]["bold"] if spec.get("bold") else LAYOUT["fonts"]["regular"], size_px)
+        font = font_for(spec.get("bold"), size_px)
         _draw_text(draw, val, (x, y), font, align=spec.get("align","left"))
 
     t = LAYOUT["table"]
     fs_desc = int(t.get("font_size_desc", 1.0) * base_px)
     fs_num  = int(t.get("font_size_num",  1.0) * base_px)
-    font_desc = _pick_font(LAYOUT["fonts"]["bold"] if t.get("bold_desc") else LAYOUT["fonts"]["regular"], fs_desc)
-    font_num  = _pick_font(LAYOUT["fonts"]["regular"], fs_num)
+    font_desc = font_for(t.get("bold_desc"), fs_desc)
+    font_num  = font_for(False, fs_num)
 
     def col_left(col_key):  return percent_to_px(W, H, (t["cols"][col_key]["x"], 0))[0]
     def col_right(col_key): return percent_to_px(W, H, (t["cols"][col_key]["x"] + t["cols"][col_key]["w"], 0))[0]
+    # column x positions don't change per row — resolve them once
+    x_desc, x_qty, x_rate, x_price = col_left("desc"), col_right("qty"), col_right("rate"), col_right("price")
 
     for i, r in enumerate(rows):
         y_pct = t["top_y"] + i * t["row_gap"]
         y = percent_to_px(W, H, (0, y_pct))[1]
-        _draw_text(draw, str(r.get("desc","")), (col_left("desc"),  y), font_desc, align="left")
-        _draw_text(draw, str(r.get("qty","")),  (col_right("qty"),  y), font_num,  align="right")
-        _draw_text(draw, str(r.get("rate","")), (col_right("rate"), y), font_num,  align="right")
-        _draw_text(draw, str(r.get("price","")),(col_right("price"),y), font_num,  align="right")
+        _draw_text(draw, str(r.get("desc","")), (x_desc,  y), font_desc, align="left")
+        _draw_text(draw, str(r.get("qty","")),  (x_qty,   y), font_num,  align="right")
+        _draw_text(draw, str(r.get("rate","")), (x_rate,  y), font_num,  align="right")
+        _draw_text(draw, str(r.get("price","")),(x_price, y), font_num,  align="right")
 
     for key, spec in LAYOUT["totals"].items():
         label = "GST" if key == "gst_label" else ("TOTAL" if key == "total_label" else None)
         value = fields.get(key, "")
         x, y = percent_to_px(W, H, spec["xy"])
         size_px = int(spec.get("size", 1.0) * base_px)
-        font = _pick_font(LAYOUT["fonts"]["bold"] if spec.get("bold") else LAYOUT["fonts"]["regular"], size_px)
+        font = font_for(spec.get("bold"), size_px)
         if label:
             _draw_text(draw, label, (x, y), font, align=spec.get("align","left"))
         else:
             _draw_text(draw, str(value or ""), (x, y), font, align=spec.get("align","right"))
     return img
 
+@st.cache_resource(max_entries=16, show_spinner=False)
+def _render_cached(key: str, _template: Image.Image, _fields: Dict[str, str], _rows: List[Dict[str, str]]) -> Image.Image:
+    return render_invoice_image(_template, _fields, _rows)
+
+def render_invoice_cached(template: Image.Image, template_path: str,
+                          fields: Dict[str, str], rows: List[Dict[str, str]]) -> Image.Image:
+    # canonical JSON -> short digest, so unchanged invoices skip FreeType + draw on rerun
+    blob = json.dumps([template_path, fields, rows], sort_keys=True, ensure_ascii=False, default=str)
+    key = hashlib.blake2b(blob.encode("utf-8"), digest_size=16).hexdigest()
+    return _render_cached(key, template, fields, rows)
+
+def _build_lines(meals, delivdays, sea, juice, snack, brk, rate_deliv,
+                 price_meal, price_sea, price_brk, price_juice, price_snack,
+                 gst_percent) -> Tuple[List[Dict[str, Any]], int, int]:
+    lines: List[Dict[str, Any]] = []
+
+    def add_line(desc, qty, rate):
+        qty_i  = int(qty) if qty else 0
+        rate_f = float(rate) if rate else 0.0
+        price  = round(qty_i * rate_f)
+        lines.append({
+            "desc": desc,
+            "qty": qty_i if qty_i else "",
+            "rate": f"{int(rate_f)}" if rate_f else "",
+            "price": f"{price}" if price else ""
+        })
+        return price
+
+    food_subtotal = 0
+    food_subtotal += add_line("Meal Plan",      meals, price_meal)
+    food_subtotal += add_line("Seafood add-on", sea,   price_sea)
+    food_subtotal += add_line("Breakfast",      brk,   price_brk)
+    food_subtotal += add_line("Juice",          juice, price_juice)
+    food_subtotal += add_line("Snack",          snack, price_snack)
+
+    gst_amount = round(food_subtotal * (gst_percent/100.0)) if gst_percent else 0
+
+    # DELIVERY — now always added whenever qty>0 OR rate>0
+    delivery_days = int(delivdays or 0)
+    delivery_rate = float(rate_deliv or 0.0)
+    delivery_amount = round(delivery_days * delivery_rate)
+    if delivery_days > 0 or delivery_rate > 0:
+        add_line("Delivery", delivery_days, delivery_rate)
+
+    return lines, gst_amount, round(food_subtotal + gst_amount + delivery_amount)
+
 def image_to_pdf_bytes(img: Image.Image) -> bytes:
     buf = io.BytesIO()
-    img.convert("RGB").save(buf, format="PDF")
+    # rendered invoices are already RGB; only convert (full-raster copy) otherwise
+    (img if img.mode == "RGB" else img.convert("RGB")).save(buf, format="PDF")
     return buf.getvalue()
 
 # ===================== APP =====================
@@ -577,17 +680,24 @@ defaults = {
     "delivery_per_day": 0.0,
     "totals": {}, "active_days": 0, "paused_days": 0, "total_days": 0,
     "paused_dates": [],
-    "admin_invoice_no": "", "manual_override": False
+    "admin_invoice_no": "", "manual_override": False,
+    # Admin quantities — seeded once so the widgets never need a per-rerun default
+    "q_meals": 26, "q_delivdays": 0, "q_sea": 0, "q_juice": 0, "q_snack": 0, "q_brk": 0,
+    "rate_deliv": 0.0,
 }
 for k,v in defaults.items():
-    if k not in st.session_state: st.session_state[k]=v
+    st.session_state.setdefault(k, v)
 
 left, mid, right = st.columns([1,2,1])
 
 # LEFT — prices
 with left:
     st.markdown("### ⚙️ Prices")
-    settings = load_settings()
+    # read settings.json once per session, not on every rerun
+    if "settings" not in st.session_state:
+        st.session_state["settings"] = load_settings()
+    settings = st.session_state["settings"]
+    # edits apply to this session's invoices right away; Save also writes settings.json
     c1, c2 = st.columns(2)
     settings["price_nutri"] = c1.number_input("Nutri (₹)", value=float(settings["price_nutri"]), step=5.0, key="p_nutri")
     settings["price_high_protein"] = c2.number_input("High Protein (₹)", value=float(settings["price_high_protein"]), step=5.0, key="p_hp")
@@ -602,22 +712,22 @@ with left:
         save_settings(settings); st.success("Saved.")
         
 def next_service_calendar_dates(after_day: date, needed: int) -> List[date]:
-    out: List[date] = []
-    cur = after_day + timedelta(days=1)
-    while len(out) < needed:
-        if cur.weekday() != 6:  # Sunday=6
-            out.append(cur)
-        cur += timedelta(days=1)
-    return out
+    # k-th non-Sunday in closed form: s service days come before the first Sunday,
+    # then one Sunday per 6 service days ((k - s)//6 + 1 is 0 while k < s)
+    first = after_day + timedelta(days=1)
+    s = (6 - first.weekday()) % 7  # Sunday=6
+    return [first + timedelta(days=k + (k - s) // 6 + 1) for k in range(needed)]
     
-def compute_from_range(client_name: str, prev_start: date, prev_end: date):
+def compute_from_range(client_name: str, prev_start: date, prev_end: date, orders_data: Optional[List[List[str]]] = None):
 
     # reset previous results
     st.session_state["fetched"] = False
     st.session_state["adjust_dates"] = []
     st.session_state["last_active_date"] = None
 
-    orders_data = fetch_values(session, spid, "Orders_Output!A2:M")
+    if orders_data is None:
+        orders_data = fetch_values(session, spid, ORDERS_RANGE)
+    orders_data = client_order_rows(orders_data, client_name)
 
     today = date.today()
 
@@ -738,12 +848,13 @@ def compute_from_range(client_name: str, prev_start: date, prev_end: date):
 # MID — workflow
 with mid:
     st.markdown("### Workflow")
+    ss = st.session_state; _get = ss.get
     cA, cB = st.columns([3,1])
-    client_in = cA.text_input("Client", value=st.session_state["client"], key="client_input")
+    client_in = cA.text_input("Client", value=ss["client"], key="client_input")
     save_mode = cB.selectbox("Save mode", ["Update latest row", "Append new row"], key="save_mode")
 
     with st.expander("Manual date override (if client missing in BillingCycle / to force a range)", expanded=False):
-        st.checkbox("Enable manual override", value=st.session_state.get("manual_override", False), key="manual_override")
+        st.checkbox("Enable manual override", key="manual_override")
         cc1, cc2 = st.columns(2)
         mo_start = cc1.text_input("Start (dd-MMM-YYYY)", value="", key="mo_start")
         mo_end   = cc2.text_input("End (dd-MMM-YYYY)",   value="", key="mo_end")
@@ -751,34 +862,40 @@ with mid:
             try: return datetime.strptime(s.strip(), "%d-%b-%Y").date() if s.strip() else None
             except: return None
         manual_start = _parse_d(mo_start); manual_end = _parse_d(mo_end)
-        if st.session_state["manual_override"] and (not manual_start or not manual_end):
+        if ss["manual_override"] and (not manual_start or not manual_end):
             st.info("Enter both Start and End to use manual override.")
 
     if st.button("📊 Fetch Usage & Plan", use_container_width=True, key="btn_fetch"):
         nm = (client_in or "").strip()
         if not nm: st.error("Enter client name.")
         else:
-            ps, pe, row_num = get_prev_cycle_for_client(session, spid, nm)
-            st.session_state["last_row_number"] = row_num
-            if st.session_state["manual_override"]:
+            need_orders = not ss["manual_override"] or (manual_start and manual_end)
+            # BillingCycle + Orders_Output in a single batchGet round-trip
+            billing_vals = orders_data = None
+            if need_orders:
+                batch = fetch_values_batch(session, spid, [BILLING_RANGE, ORDERS_RANGE])
+                billing_vals, orders_data = batch.get(BILLING_RANGE), batch.get(ORDERS_RANGE)
+            ps, pe, row_num = get_prev_cycle_for_client(session, spid, nm, billing_vals)
+            ss["last_row_number"] = row_num
+            if ss["manual_override"]:
                 if manual_start and manual_end:
-                    compute_from_range(nm, manual_start, manual_end)
+                    compute_from_range(nm, manual_start, manual_end, orders_data)
                     st.success("Computed from manual override.")
                 else:
                     st.error("Manual override enabled. Please enter Start & End.")
             else:
                 if ps and pe:
-                    compute_from_range(nm, ps, pe)
+                    compute_from_range(nm, ps, pe, orders_data)
                     st.success("Computed from BillingCycle.")
                 else:
                     st.warning("Client not found in BillingCycle. Use manual override.")
 
-    if st.session_state["fetched"]:
-        totals = st.session_state["totals"]
+    if ss["fetched"]:
+        totals = ss["totals"]
         st.markdown("#### Usage Summary")
         lines = [f"- **Meals total:** {totals.get('meals_total',0)}"]
 
-        slot_counts = st.session_state.get("slot_counts", {})
+        slot_counts = _get("slot_counts", {})
         
         if slot_counts:
             lines.append("- **Slot deliveries:**")
@@ -790,13 +907,13 @@ with mid:
             lines.append(f"- **Juices total:** {totals['juices_total']} (J1: {totals.get('j1',0)}, J2: {totals.get('j2',0)})")
         if totals.get("brk",0)>0:     lines.append(f"- **Breakfast total:** {totals['brk']}")
         lines += [
-            f"- **Active days:** {st.session_state['active_days']}",
-            f"- **Paused days:** {st.session_state['paused_days']}",
-            f"- **Total days:** {st.session_state['total_days']}",
+            f"- **Active days:** {ss['active_days']}",
+            f"- **Paused days:** {ss['paused_days']}",
+            f"- **Total days:** {ss['total_days']}",
         ]
         st.markdown("\n".join(lines))
-        last_meal = st.session_state.get("last_active_date")
-        prev_end = st.session_state.get("prev_end")
+        last_meal = _get("last_active_date")
+        prev_end = _get("prev_end")
 
         if last_meal and prev_end and last_meal < prev_end:
             pause_start = last_meal + timedelta(days=1)
@@ -806,42 +923,42 @@ with mid:
                 f"Subscription paused since **{dtstr(pause_start)}**. "
                 f"Client has not resumed meals yet."
             )
-        paused = sorted(st.session_state['paused_dates'])
+        paused = sorted(ss['paused_dates'])
         paused_text = ", ".join(dtstr(d) for d in paused) if paused else "None"
         st.markdown("**Paused dates:** " + paused_text)
 
         st.markdown("#### Next Cycle Planner")
-        adj_needed = st.session_state['paused_days']
+        adj_needed = ss['paused_days']
         notes = [
-            f"- **Previous bill range:** {dtstr(st.session_state['prev_start'])} → {dtstr(st.session_state['prev_end'])}",
+            f"- **Previous bill range:** {dtstr(ss['prev_start'])} → {dtstr(ss['prev_end'])}",
             f"- **Paused days to adjust:** {adj_needed}",
         ]
         if adj_needed:
-            adj_dates = st.session_state.get("adjust_dates", [])
+            adj_dates = _get("adjust_dates", [])
             notes.append("- **Adjustment dates:** " + ", ".join(dtstr(d) for d in adj_dates))
         else:
             notes.append("- **Adjustment dates:** None")
         notes += [
-            f"- **New bill start:** {dtstr(st.session_state['next_start']) if st.session_state['next_start'] else 'Not available'}",
-            f"- **New bill end:** {dtstr(st.session_state['next_end']) if st.session_state['next_end'] else 'Not available'}",
+            f"- **New bill start:** {dtstr(ss['next_start']) if ss['next_start'] else 'Not available'}",
+            f"- **New bill end:** {dtstr(ss['next_end']) if ss['next_end'] else 'Not available'}",
         ]
         st.markdown("\n".join(notes))
 
         c1, c2 = st.columns(2)
-        if st.session_state["next_start"] and st.session_state["next_end"]:
+        if ss["next_start"] and ss["next_end"]:
             if c1.button("✅ Save Next Cycle to BillingCycle", use_container_width=True, key="save_cycle"):
                 try:
-                    if st.session_state["save_mode"]=="Update latest row" and st.session_state.get("last_row_number"):
-                        update_cycle_row(session, spid, st.session_state["last_row_number"],
-                                         st.session_state["client"], st.session_state["next_start"], st.session_state["next_end"])
+                    if ss["save_mode"]=="Update latest row" and _get("last_row_number"):
+                        update_cycle_row(session, spid, ss["last_row_number"],
+                                         ss["client"], ss["next_start"], ss["next_end"])
                         st.success("Updated BillingCycle.")
                     else:
-                        append_cycle_row(session, spid, st.session_state["client"],
-                                         st.session_state["next_start"], st.session_state["next_end"])
+                        append_cycle_row(session, spid, ss["client"],
+                                         ss["next_start"], ss["next_end"])
                         st.success("Appended to BillingCycle.")
                 except Exception as e:
                     st.error(f"Save failed: {e}")
-        st.info(f"Per-day delivery (learned): ₹{st.session_state['delivery_per_day']:.2f}")
+        st.info(f"Per-day delivery (learned): ₹{ss['delivery_per_day']:.2f}")
 
         st.markdown("---")
         st.markdown("### Invoice")
@@ -849,50 +966,23 @@ with mid:
         do_preview = colp.button("🖼️ Generate Preview", use_container_width=True, key="btn_preview")
         do_pdf     = cold.button("⬇️ Download PDF", use_container_width=True, key="btn_pdf")
 
-        price_meal = settings["price_high_protein"] if st.session_state.get("admin_plan","Nutri")=="High Protein" else settings["price_nutri"]
-        lines_for_preview = []
-
-        def add_line(desc, qty, rate):
-            qty_i  = int(qty) if qty else 0
-            rate_f = float(rate) if rate else 0.0
-            price  = round(qty_i * rate_f)
-            lines_for_preview.append({
-                "desc": desc,
-                "qty": qty_i if qty_i else "",
-                "rate": f"{int(rate_f)}" if rate_f else "",
-                "price": f"{price}" if price else ""
-            })
-            return price
-
-        food_subtotal = 0
-        food_subtotal += add_line("Meal Plan",      st.session_state.get("q_meals", 26), price_meal)
-        food_subtotal += add_line("Seafood add-on", st.session_state.get("q_sea", 0),    settings["price_seafood_addon"])
-        food_subtotal += add_line("Breakfast",      st.session_state.get("q_brk", 0),    settings["price_breakfast"])
-        food_subtotal += add_line("Juice",          st.session_state.get("q_juice", 0),  settings["price_juice"])
-        food_subtotal += add_line("Snack",          st.session_state.get("q_snack", 0),  settings["price_snack"])
-
-        gst_amount = round(food_subtotal * (settings["gst_percent"]/100.0)) if settings["gst_percent"] else 0
-
-        # DELIVERY — now always added whenever qty>0 OR rate>0
-        delivery_days = int(st.session_state.get("q_delivdays", st.session_state.get("active_days", 0)) or 0)
-        delivery_rate = float(st.session_state.get("rate_deliv", st.session_state.get("delivery_per_day", 0.0)) or 0.0)
-        delivery_amount = round(delivery_days * delivery_rate)
-        if delivery_days > 0 or delivery_rate > 0:
-            add_line("Delivery", delivery_days, delivery_rate)
-
-        grand_total = round(food_subtotal + gst_amount + delivery_amount)
-
-        dur_start_text = (st.session_state.get("adm_start") or "").strip()
-        dur_end_text   = (st.session_state.get("adm_end") or "").strip()
-        client_label   = (st.session_state.get("adm_client_lbl") or st.session_state.get("client","")).strip()
-        bill_date_text = st.session_state.get("adm_bill_date", date.today())
+        price_meal = settings["price_high_protein"] if _get("admin_plan","Nutri")=="High Protein" else settings["price_nutri"]
+        lines_for_preview, gst_amount, grand_total = _build_lines(
+            ss["q_meals"], ss["q_delivdays"], ss["q_sea"], ss["q_juice"], ss["q_snack"], ss["q_brk"],
+            ss["rate_deliv"], price_meal, settings["price_seafood_addon"], settings["price_breakfast"],
+            settings["price_juice"], settings["price_snack"], settings["gst_percent"])
+
+        dur_start_text = (_get("adm_start") or "").strip()
+        dur_end_text   = (_get("adm_end") or "").strip()
+        client_label   = (_get("adm_client_lbl") or _get("client","")).strip()
+        bill_date_text = _get("adm_bill_date", date.today())
         if isinstance(bill_date_text, date):
-            bill_date_text = bill_date_text.strftime("%d-%b-%Y")
+            bill_date_text = dtstr(bill_date_text)
 
         fields = {
             "dur_start":  dur_start_text,
             "dur_end":    dur_end_text,
-            "invoice_no": st.session_state.get("admin_invoice_no","").strip(),
+            "invoice_no": _get("admin_invoice_no","").strip(),
             "bill_date":  bill_date_text,
             "days":       "Days- 26",
             "client":     client_label,
@@ -902,22 +992,22 @@ with mid:
             "total_value": f"₹{grand_total}",
         }
 
-        template_img = try_load_template()
         if (do_preview or do_pdf):
+            template_img, template_path = try_load_template()
             if not template_img:
                 st.error("Template PNG not found. Place `invoice_template_a4.png` beside the app.")
             else:
                 visible_rows = [r for r in lines_for_preview if (r["qty"] or r["price"])]
                 if not visible_rows:
                     visible_rows = [{"desc":"Meal Plan","qty":"","rate":"","price":""}]
-                inv_img = render_invoice_image(template_img, fields, visible_rows)
+                inv_img = render_invoice_cached(template_img, template_path, fields, visible_rows)
                 st.image(inv_img, caption="Invoice Preview", use_column_width=True)
                 if do_pdf:
                     pdf_bytes = image_to_pdf_bytes(inv_img)
                     st.download_button(
                         "Download Invoice PDF",
                         data=pdf_bytes,
-                        file_name=f"Invoice_{(st.session_state['client'] or 'Client').replace(' ','_')}_{date.today().strftime('%Y%m%d')}.pdf",
+                        file_name=f"Invoice_{(ss['client'] or 'Client').replace(' ','_')}_{date.today().strftime('%Y%m%d')}.pdf",
                         mime="application/pdf",
                         use_container_width=True
                     )
@@ -925,34 +1015,34 @@ with mid:
 # RIGHT — admin
 with right:
     st.markdown("### 🛠️ Admin")
-    st.text_input("Client label (print as)", value=(st.session_state.get("adm_client_lbl") or st.session_state.get("client","")), key="adm_client_lbl")
-    st.date_input("Billing date", value=(st.session_state.get("adm_bill_date") or date.today()), key="adm_bill_date")
-    st.selectbox("Plan", ["Nutri", "High Protein"], index=(0 if st.session_state.get("admin_plan","Nutri")=="Nutri" else 1), key="admin_plan")
+    ss = st.session_state; _get = ss.get
+    st.text_input("Client label (print as)", value=(_get("adm_client_lbl") or _get("client","")), key="adm_client_lbl")
+    st.date_input("Billing date", value=(_get("adm_bill_date") or date.today()), key="adm_bill_date")
+    st.selectbox("Plan", ["Nutri", "High Protein"], index=(0 if _get("admin_plan","Nutri")=="Nutri" else 1), key="admin_plan")
 
     def _prefill(d: Optional[date]) -> str: return dtstr(d) if isinstance(d,date) else ""
-    if st.session_state["fetched"]:
-        if not st.session_state.get("adm_start"): st.session_state["adm_start"] = _prefill(st.session_state["next_start"])
-        if not st.session_state.get("adm_end"):   st.session_state["adm_end"]   = _prefill(st.session_state["next_end"])
+    if ss["fetched"]:
+        if not _get("adm_start"): ss["adm_start"] = _prefill(ss["next_start"])
+        if not _get("adm_end"):   ss["adm_end"]   = _prefill(ss["next_end"])
 
-    st.text_input("Bill start (dd-MMM-YYYY)", value=st.session_state.get("adm_start",""), key="adm_start")
-    st.text_input("Bill end (dd-MMM-YYYY)",   value=st.session_state.get("adm_end",""),   key="adm_end")
-    st.text_input("Invoice No.", value=st.session_state.get("admin_invoice_no",""), key="admin_invoice_no")
+    st.text_input("Bill start (dd-MMM-YYYY)", key="adm_start")
+    st.text_input("Bill end (dd-MMM-YYYY)",   key="adm_end")
+    st.text_input("Invoice No.", key="admin_invoice_no")
 
-    auto_dur = ""
-    if st.session_state.get("adm_start") and st.session_state.get("adm_end"):
-        auto_dur = f"from {st.session_state['adm_start']} to {st.session_state['adm_end']}"
-        if not st.session_state.get("adm_dur"): st.session_state["adm_dur"] = auto_dur
-    st.text_input("Bill duration text", value=st.session_state.get("adm_dur", auto_dur), key="adm_dur")
+    # default duration text is only built while the field is still empty
+    if not _get("adm_dur"):
+        start_txt = _get("adm_start"); end_txt = start_txt and _get("adm_end")
+        if end_txt: ss["adm_dur"] = f"from {start_txt} to {end_txt}"
+    st.text_input("Bill duration text", key="adm_dur")
 
+    # quantities commit to session state on every edit, so Preview/PDF always see them
     st.markdown("**Quantities** *(rates & GST in left console)*")
-    st.number_input("Meals qty", value=st.session_state.get("q_meals", 26), step=1, min_value=0, key="q_meals")
-    st.number_input("Delivery days", value=st.session_state.get("q_delivdays", st.session_state.get("active_days",0)), step=1, min_value=0, key="q_delivdays")
+    st.number_input("Meals qty", step=1, min_value=0, key="q_meals")
+    st.number_input("Delivery days", step=1, min_value=0, key="q_delivdays")
 
-    c3, c4, c5 = st.columns(3)
-    c3.number_input("Seafood qty", value=st.session_state.get("q_sea", 0), step=1, min_value=0, key="q_sea")
-    c4.number_input("Juice qty",   value=st.session_state.get("q_juice", 0), step=1, min_value=0, key="q_juice")
-    c5.number_input("Snack qty",   value=st.session_state.get("q_snack", 0), step=1, min_value=0, key="q_snack")
+    for col, (key, label) in zip(st.columns(3), ADMIN_QTY_FIELDS):
+        col.number_input(label, step=1, min_value=0, key=key)
 
     c6, c7 = st.columns(2)
-    c6.number_input("Breakfast qty", value=st.session_state.get("q_brk", 0), step=1, min_value=0, key="q_brk")
-    c7.number_input("Delivery per day (₹)", value=float(st.session_state.get("rate_deliv", st.session_state.get("delivery_per_day", 0.0))), step=5.0, key="rate_deliv")
+    c6.number_input("Breakfast qty", step=1, min_value=0, key="q_brk")
+    c7.number_input("Delivery per day (₹)", step=5.0, key="rate_deliv")